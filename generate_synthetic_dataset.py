@@ -20,6 +20,19 @@ import json
 from collections import defaultdict
 from faker import Faker
 
+# orjson is optional; fall back to the stdlib encoder when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow is optional; it is only used when relationship data is passed as Arrow tables
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
 # Initialize Faker with a specific locale for more realistic data
 fake = Faker(['en_US'])
 
@@ -29,6 +42,7 @@ fake = Faker(['en_US'])
 
 # Output directory
 OUTPUT_DIR = "umbc_data"
+EXPORT_BUFFER_SIZE = 1 << 20   # Write buffer size for each exported file (bytes)
 
 # Data Size Configuration
 NUM_STUDENTS = 500        # Reduced number of students for more focused data
@@ -75,6 +89,14 @@ GRADE_DISTRIBUTION = {
     "W": 0.01  # Withdrawal
 }
 
+# Integer grade codes stored on COMPLETED relationships as gradeCode
+# (same order as the AI coach's grade points table, withdrawal last)
+GRADE_CODES = {
+    grade: code for code, grade in enumerate(
+        ["A", "A-", "B+", "B", "B-", "C+", "C", "C-", "D+", "D", "F", "W"]
+    )
+}
+
 # The departments at UMBC (focused on CS and Biology)
 DEPARTMENTS = [
     "Computer Science",
@@ -889,6 +911,39 @@ def generate_course_similarity(courses):
     
     return list(content_dict.values()), list(difficulty_dict.values())
 
+def merge_course_similarity(similarity_content, similarity_difficulty):
+    """
+    Merge content and difficulty similarity into a single record per course pair.
+    
+    Either score may be None when the pair only has one kind of similarity.
+    """
+    merged = {}
+    for sim in similarity_content:
+        merged[(sim["source"], sim["target"])] = {"content": sim["similarity"], "difficulty": None}
+    for sim in similarity_difficulty:
+        merged.setdefault((sim["source"], sim["target"]), {"content": None})["difficulty"] = sim["similarity"]
+    
+    return [
+        {"source": source, "target": target, "content": scores["content"], "difficulty": scores["difficulty"]}
+        for (source, target), scores in merged.items()
+    ]
+
+def generate_course_term_relationships(courses, terms):
+    """
+    Generate OFFERED_IN relationships between courses and the terms of each
+    type listed in their term availability.
+    """
+    terms_by_type = defaultdict(list)
+    for term in terms:
+        terms_by_type[term["type"]].append(term["id"])
+    
+    return [
+        {"courseId": course["id"], "termId": term_id}
+        for course in courses
+        for term_type in course["termAvailability"]
+        for term_id in terms_by_type[term_type]
+    ]
+
 def generate_student_degree_relationships(students, degrees):
     """
     Generate relationships between students and degrees.
@@ -1068,6 +1123,7 @@ def generate_student_course_history(students, courses, terms, prerequisites):
                         "courseId": course["id"],
                         "term": term["id"],
                         "grade": grade,
+                        "gradeCode": GRADE_CODES[grade],
                         "difficulty": perceived_difficulty,
                         "timeSpent": time_spent,
                         "instructionMode": instruction_mode,
@@ -1411,15 +1467,105 @@ def generate_textbook_interactions(students, courses, textbooks, course_textbook
 #                           EXPORT FUNCTIONS
 # =============================================================================
 
+# Cypher/CSV literals for boolean properties
+_BOOL_STR = {True: "true", False: "false"}
+
+class _MinGradeSuffix(dict):
+    """
+    Memoized Cypher property suffix for a prerequisite's minimum grade.
+    """
+    def __missing__(self, grade):
+        suffix = f', minGrade: "{grade}"' if grade else ""
+        self[grade] = suffix
+        return suffix
+
+_MIN_GRADE_SUFFIX = _MinGradeSuffix()
+
+def _qlist(items):
+    """
+    Format a list of strings as a Cypher list literal, e.g. ["a", "b"].
+    """
+    return '["' + '", "'.join(items) + '"]' if items else "[]"
+
+def _is_arrow_table(records):
+    """
+    Check whether a dataset was supplied as a pyarrow Table instead of a list of dicts.
+    """
+    return pa is not None and isinstance(records, pa.Table)
+
+def _iter_records(records):
+    """
+    Iterate dict rows from either a list of dicts or a pyarrow Table.
+    
+    Tables are converted one record batch at a time, so only a batch of
+    rows exists as Python dicts at once.
+    """
+    if not _is_arrow_table(records):
+        yield from records
+        return
+    for batch in records.to_batches():
+        yield from batch.to_pylist()
+
+def _write_arrow_csv(f, table, header, columns, rel_type):
+    """
+    Write a relationship table as a neo4j-admin CSV using Arrow's native writer.
+    
+    `columns` gives the table column for each header entry; None marks the
+    :TYPE column, which is filled with `rel_type`.
+    """
+    arrays = [
+        pa.repeat(rel_type, table.num_rows) if column is None else table.column(column)
+        for column in columns
+    ]
+    pa_csv.write_csv(
+        pa.table(arrays, names=header), f,
+        write_options=pa_csv.WriteOptions(include_header=True, delimiter=",", quoting_style="needed")
+    )
+
+def _open_output_dir(output_dir):
+    """
+    Create the output directory if needed and return a handle for _raw_open.
+    
+    The handle is a directory descriptor where the platform supports dir_fd
+    (not on Windows); otherwise it is the directory path itself.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if os.open not in os.supports_dir_fd:
+        return output_dir
+    return os.open(output_dir, os.O_RDONLY | os.O_DIRECTORY)
+
+def _close_output_dir(out_dir):
+    """
+    Release a handle returned by _open_output_dir.
+    """
+    if isinstance(out_dir, int):
+        os.close(out_dir)
+
+def _raw_open(out_dir, name, mode="w", bufsize=EXPORT_BUFFER_SIZE, newline=None):
+    """
+    Open an export file for writing inside an output directory handle.
+    """
+    if not isinstance(out_dir, int):
+        return open(os.path.join(out_dir, name), mode, buffering=bufsize, newline=newline)
+    fd = os.open(name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=out_dir)
+    return os.fdopen(fd, mode, buffering=bufsize, newline=newline)
+
 def export_to_cypher(data, output_dir):
     """
     Export data to Cypher script files.
     """
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-    
+    out_dir = _open_output_dir(output_dir)
+    try:
+        _write_cypher_files(data, out_dir)
+    finally:
+        _close_output_dir(out_dir)
+
+def _write_cypher_files(data, out_dir):
+    """
+    Write the Cypher script files inside an open output directory.
+    """
     # 1. Export students
-    with open(os.path.join(output_dir, "01_students.cypher"), "w") as f:
+    with _raw_open(out_dir, "01_students.cypher") as f:
         for student in data["students"]:
             cypher = f"""
 CREATE (s:Student {{
@@ -1438,22 +1584,22 @@ CREATE (s:Student {{
             f.write(cypher)
     
     # 2. Export faculty
-    with open(os.path.join(output_dir, "02_faculty.cypher"), "w") as f:
+    with _raw_open(out_dir, "02_faculty.cypher") as f:
         for faculty in data["faculty"]:
-            teaching_styles_str = ", ".join([f'"{style}"' for style in faculty["teachingStyle"]])
+            teaching_styles_str = _qlist(faculty["teachingStyle"])
             cypher = f"""
 CREATE (f:Faculty {{
     id: "{faculty["id"]}",
     name: "{faculty["name"]}",
     department: "{faculty["department"]}",
-    teachingStyle: [{teaching_styles_str}],
+    teachingStyle: {teaching_styles_str},
     avgRating: {faculty["avgRating"]}
 }});
 """
             f.write(cypher)
     
     # 3. Export terms
-    with open(os.path.join(output_dir, "03_terms.cypher"), "w") as f:
+    with _raw_open(out_dir, "03_terms.cypher") as f:
         for term in data["terms"]:
             cypher = f"""
 CREATE (t:Term {{
@@ -1467,11 +1613,11 @@ CREATE (t:Term {{
             f.write(cypher)
             
     # 4. Export courses
-    with open(os.path.join(output_dir, "04_courses.cypher"), "w") as f:
+    with _raw_open(out_dir, "04_courses.cypher") as f:
         for course in data["courses"]:
-            term_avail_str = ", ".join([f'"{term}"' for term in course["termAvailability"]])
-            instruction_modes_str = ", ".join([f'"{mode}"' for mode in course["instructionModes"]])
-            tags_str = ", ".join([f'"{tag}"' for tag in course.get("tags", [])])
+            term_avail_str = _qlist(course["termAvailability"])
+            instruction_modes_str = _qlist(course["instructionModes"])
+            tags_str = _qlist(course.get("tags", []))
             
             # Handle optional fields
             visual_success = f', visualLearnerSuccess: {course.get("visualLearnerSuccess", 0.8)}' if "visualLearnerSuccess" in course else ""
@@ -1488,15 +1634,15 @@ CREATE (c:Course {{
     level: {course["level"]},
     avgDifficulty: {course["avgDifficulty"]},
     avgTimeCommitment: {course["avgTimeCommitment"]},
-    termAvailability: [{term_avail_str}],
-    instructionModes: [{instruction_modes_str}],
-    tags: [{tags_str}]{visual_success}{auditory_success}{kinesthetic_success}{reading_success}
+    termAvailability: {term_avail_str},
+    instructionModes: {instruction_modes_str},
+    tags: {tags_str}{visual_success}{auditory_success}{kinesthetic_success}{reading_success}
 }});
 """
             f.write(cypher)
             
     # 5. Export degrees
-    with open(os.path.join(output_dir, "05_degrees.cypher"), "w") as f:
+    with _raw_open(out_dir, "05_degrees.cypher") as f:
         for degree in data["degrees"]:
             cypher = f"""
 CREATE (d:Degree {{
@@ -1512,7 +1658,7 @@ CREATE (d:Degree {{
             f.write(cypher)
             
     # 6. Export requirement groups
-    with open(os.path.join(output_dir, "06_requirement_groups.cypher"), "w") as f:
+    with _raw_open(out_dir, "06_requirement_groups.cypher") as f:
         for req in data["requirement_groups"]:
             cypher = f"""
 CREATE (r:RequirementGroup {{
@@ -1526,9 +1672,9 @@ CREATE (r:RequirementGroup {{
             f.write(cypher)
     
     # 7. Export relationships: Course Prerequisites
-    with open(os.path.join(output_dir, "07_course_prerequisites.cypher"), "w") as f:
+    with _raw_open(out_dir, "07_course_prerequisites.cypher") as f:
         for prereq in data["prerequisites"]:
-            min_grade = f', minGrade: "{prereq["minGrade"]}"' if prereq["minGrade"] else ""
+            min_grade = _MIN_GRADE_SUFFIX[prereq["minGrade"]]
             cypher = f"""
 MATCH (source:Course {{id: "{prereq["source"]}"}}), (target:Course {{id: "{prereq["target"]}"}})
 CREATE (source)-[:PREREQUISITE_FOR {{strength: "{prereq["strength"]}"{min_grade}}}]->(target);
@@ -1536,8 +1682,8 @@ CREATE (source)-[:PREREQUISITE_FOR {{strength: "{prereq["strength"]}"{min_grade}
             f.write(cypher)
             
     # 8. Export relationships: LEADS_TO
-    with open(os.path.join(output_dir, "08_leads_to.cypher"), "w") as f:
-        for lead in data["leads_to"]:
+    with _raw_open(out_dir, "08_leads_to.cypher") as f:
+        for lead in _iter_records(data["leads_to"]):
             cypher = f"""
 MATCH (source:Course {{id: "{lead["source"]}"}}), (target:Course {{id: "{lead["target"]}"}})
 CREATE (source)-[:LEADS_TO {{commonality: {lead["commonality"]}, successCorrelation: {lead["successCorrelation"]}}}]->(target);
@@ -1545,25 +1691,18 @@ CREATE (source)-[:LEADS_TO {{commonality: {lead["commonality"]}, successCorrelat
             f.write(cypher)
             
     # 9. Export relationships: Course similarity
-    with open(os.path.join(output_dir, "09_course_similarity.cypher"), "w") as f:
-        # Content similarity
-        for sim in data["similarity_content"]:
-            cypher = f"""
-MATCH (source:Course {{id: "{sim["source"]}"}}), (target:Course {{id: "{sim["target"]}"}})
-CREATE (source)-[:SIMILAR_CONTENT {{similarity: {sim["similarity"]}}}]->(target);
-"""
-            f.write(cypher)
-            
-        # Difficulty similarity
-        for sim in data["similarity_difficulty"]:
+    with _raw_open(out_dir, "09_course_similarity.cypher") as f:
+        for sim in _iter_records(data["course_similarity"]):
+            # Only emit the similarity scores present for this pair
+            scores = ", ".join(f"{key}: {sim[key]}" for key in ("content", "difficulty") if sim[key] is not None)
             cypher = f"""
 MATCH (source:Course {{id: "{sim["source"]}"}}), (target:Course {{id: "{sim["target"]}"}})
-CREATE (source)-[:SIMILAR_DIFFICULTY {{similarity: {sim["similarity"]}}}]->(target);
+CREATE (source)-[:SIMILAR {{{scores}}}]->(target);
 """
             f.write(cypher)
     
     # 10. Export relationships: Student-Degree
-    with open(os.path.join(output_dir, "10_student_degree.cypher"), "w") as f:
+    with _raw_open(out_dir, "10_student_degree.cypher") as f:
         for rel in data["student_degree"]:
             cypher = f"""
 MATCH (s:Student {{id: "{rel["studentId"]}"}}), (d:Degree {{id: "{rel["degreeId"]}"}})
@@ -1572,24 +1711,25 @@ CREATE (s)-[:PURSUING]->(d);
             f.write(cypher)
             
     # 11. Export relationships: Faculty-Course
-    with open(os.path.join(output_dir, "11_teaching.cypher"), "w") as f:
+    with _raw_open(out_dir, "11_teaching.cypher") as f:
         for teach in data["teaching"]:
-            terms_str = ", ".join([f'"{term}"' for term in teach["terms"]])
+            terms_str = _qlist(teach["terms"])
             cypher = f"""
 MATCH (f:Faculty {{id: "{teach["facultyId"]}"}}), (c:Course {{id: "{teach["courseId"]}"}})
-CREATE (f)-[:TEACHES {{terms: [{terms_str}]}}]->(c);
+CREATE (f)-[:TEACHES {{terms: {terms_str}}}]->(c);
 """
             f.write(cypher)
             
     # 12. Export relationships: Student-Course (Completed)
-    with open(os.path.join(output_dir, "12_completed_courses.cypher"), "w") as f:
-        for comp in data["completed_courses"]:
-            enjoyment = "true" if comp["enjoyment"] else "false"
+    with _raw_open(out_dir, "12_completed_courses.cypher") as f:
+        for comp in _iter_records(data["completed_courses"]):
+            enjoyment = _BOOL_STR[comp["enjoyment"]]
             cypher = f"""
 MATCH (s:Student {{id: "{comp["studentId"]}"}}), (c:Course {{id: "{comp["courseId"]}"}})
 CREATE (s)-[:COMPLETED {{
     term: "{comp["term"]}",
     grade: "{comp["grade"]}",
+    gradeCode: {comp["gradeCode"]},
     difficulty: {comp["difficulty"]},
     timeSpent: {comp["timeSpent"]},
     instructionMode: "{comp["instructionMode"]}",
@@ -1599,7 +1739,7 @@ CREATE (s)-[:COMPLETED {{
             f.write(cypher)
             
     # 13. Export relationships: Student-Course (Enrolled)
-    with open(os.path.join(output_dir, "13_enrolled_courses.cypher"), "w") as f:
+    with _raw_open(out_dir, "13_enrolled_courses.cypher") as f:
         for enroll in data["enrolled_courses"]:
             cypher = f"""
 MATCH (s:Student {{id: "{enroll["studentId"]}"}}), (c:Course {{id: "{enroll["courseId"]}"}})
@@ -1608,7 +1748,7 @@ CREATE (s)-[:ENROLLED_IN]->(c);
             f.write(cypher)
             
     # 14. Export relationships: Student similarity
-    with open(os.path.join(output_dir, "14_student_similarity.cypher"), "w") as f:
+    with _raw_open(out_dir, "14_student_similarity.cypher") as f:
         # Learning style similarity
         for sim in data["learning_style_similarity"]:
             cypher = f"""
@@ -1619,15 +1759,15 @@ CREATE (source)-[:SIMILAR_LEARNING_STYLE {{similarity: {sim["similarity"]}}}]->(
             
         # Performance similarity
         for sim in data["performance_similarity"]:
-            courses_str = ", ".join([f'"{c}"' for c in sim["courses"]])
+            courses_str = _qlist(sim["courses"])
             cypher = f"""
 MATCH (source:Student {{id: "{sim["sourceId"]}"}}), (target:Student {{id: "{sim["targetId"]}"}})
-CREATE (source)-[:SIMILAR_PERFORMANCE {{similarity: {sim["similarity"]}, courses: [{courses_str}]}}]->(target);
+CREATE (source)-[:SIMILAR_PERFORMANCE {{similarity: {sim["similarity"]}, courses: {courses_str}}}]->(target);
 """
             f.write(cypher)
             
     # 15. Export relationships: Requirement Group - Degree
-    with open(os.path.join(output_dir, "15_requirement_degree.cypher"), "w") as f:
+    with _raw_open(out_dir, "15_requirement_degree.cypher") as f:
         for req in data["requirement_groups"]:
             cypher = f"""
 MATCH (r:RequirementGroup {{id: "{req["id"]}"}}), (d:Degree {{id: "{req["degreeId"]}"}})
@@ -1636,7 +1776,7 @@ CREATE (r)-[:PART_OF]->(d);
             f.write(cypher)
             
     # 16. Export relationships: Course - Requirement Group
-    with open(os.path.join(output_dir, "16_course_requirement.cypher"), "w") as f:
+    with _raw_open(out_dir, "16_course_requirement.cypher") as f:
         for req in data["requirement_groups"]:
             for course_id in req["courses"]:
                 cypher = f"""
@@ -1646,20 +1786,16 @@ CREATE (c)-[:FULFILLS]->(r);
                 f.write(cypher)
                 
     # 17. Export relationships: Course - Term
-    with open(os.path.join(output_dir, "17_course_term.cypher"), "w") as f:
-        for course in data["courses"]:
-            for term_type in course["termAvailability"]:
-                # For each matching term
-                for term in data["terms"]:
-                    if term["type"] == term_type:
-                        cypher = f"""
-MATCH (c:Course {{id: "{course["id"]}"}}), (t:Term {{id: "{term["id"]}"}})
+    with _raw_open(out_dir, "17_course_term.cypher") as f:
+        for offered in data["course_terms"]:
+            cypher = f"""
+MATCH (c:Course {{id: "{offered["courseId"]}"}}), (t:Term {{id: "{offered["termId"]}"}})
 CREATE (c)-[:OFFERED_IN]->(t);
 """
-                        f.write(cypher)
+            f.write(cypher)
                         
     # 18. Create indexes and constraints
-    with open(os.path.join(output_dir, "00_indexes.cypher"), "w") as f:
+    with _raw_open(out_dir, "00_indexes.cypher") as f:
         f.write("""
 // Uniqueness constraints
 CREATE CONSTRAINT FOR (s:Student) REQUIRE s.id IS UNIQUE;
@@ -1682,11 +1818,18 @@ def export_to_csv(data, output_dir):
     """
     Export data to CSV files for Neo4j Import.
     """
-    # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
-    
+    out_dir = _open_output_dir(output_dir)
+    try:
+        _write_csv_files(data, out_dir)
+    finally:
+        _close_output_dir(out_dir)
+
+def _write_csv_files(data, out_dir):
+    """
+    Write the CSV import files inside an open output directory.
+    """
     # 1. Export students
-    with open(os.path.join(output_dir, "students.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "students.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             "id:ID(Student)", "name", "enrollmentDate", "expectedGraduation", 
@@ -1709,7 +1852,7 @@ def export_to_csv(data, output_dir):
             ])
     
     # 2. Export faculty
-    with open(os.path.join(output_dir, "faculty.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "faculty.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             "id:ID(Faculty)", "name", "department", "teachingStyle", "avgRating:float"
@@ -1725,7 +1868,7 @@ def export_to_csv(data, output_dir):
             ])
     
     # 3. Export terms
-    with open(os.path.join(output_dir, "terms.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "terms.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             "id:ID(Term)", "name", "startDate", "endDate", "type"
@@ -1741,7 +1884,7 @@ def export_to_csv(data, output_dir):
             ])
             
     # 4. Export courses
-    with open(os.path.join(output_dir, "courses.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "courses.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             "id:ID(Course)", "name", "department", "credits:int", "level:int",
@@ -1769,7 +1912,7 @@ def export_to_csv(data, output_dir):
             ])
             
     # 5. Export degrees
-    with open(os.path.join(output_dir, "degrees.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "degrees.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             "id:ID(Degree)", "name", "department", "type", "totalCreditsRequired:int",
@@ -1788,7 +1931,7 @@ def export_to_csv(data, output_dir):
             ])
             
     # 6. Export requirement groups
-    with open(os.path.join(output_dir, "requirement_groups.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "requirement_groups.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             "id:ID(RequirementGroup)", "name", "description", "minimumCourses:int", "minimumCredits:int"
@@ -1804,7 +1947,7 @@ def export_to_csv(data, output_dir):
             ])
     
     # 7. Export relationship: Prerequisites
-    with open(os.path.join(output_dir, "prerequisites.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "prerequisites.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Course)", ":END_ID(Course)", ":TYPE", "strength", "minGrade"
@@ -1820,52 +1963,52 @@ def export_to_csv(data, output_dir):
             ])
             
     # 8. Export relationship: LEADS_TO
-    with open(os.path.join(output_dir, "leads_to.csv"), "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            ":START_ID(Course)", ":END_ID(Course)", ":TYPE", "commonality:float", "successCorrelation:float"
-        ])
-        
-        for lead in data["leads_to"]:
-            writer.writerow([
-                lead["source"],
-                lead["target"],
-                "LEADS_TO",
-                lead["commonality"],
-                lead["successCorrelation"]
-            ])
+    header = [
+        ":START_ID(Course)", ":END_ID(Course)", ":TYPE", "commonality:float", "successCorrelation:float"
+    ]
+    if _is_arrow_table(data["leads_to"]):
+        with _raw_open(out_dir, "leads_to.csv", "wb") as f:
+            _write_arrow_csv(f, data["leads_to"], header,
+                             ["source", "target", None, "commonality", "successCorrelation"], "LEADS_TO")
+    else:
+        with _raw_open(out_dir, "leads_to.csv", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            
+            for lead in data["leads_to"]:
+                writer.writerow([
+                    lead["source"],
+                    lead["target"],
+                    "LEADS_TO",
+                    lead["commonality"],
+                    lead["successCorrelation"]
+                ])
             
     # 9. Export relationship: Course similarity
-    with open(os.path.join(output_dir, "course_similarity_content.csv"), "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            ":START_ID(Course)", ":END_ID(Course)", ":TYPE", "similarity:float"
-        ])
-        
-        for sim in data["similarity_content"]:
-            writer.writerow([
-                sim["source"],
-                sim["target"],
-                "SIMILAR_CONTENT",
-                sim["similarity"]
-            ])
+    # Missing scores are written as empty strings and skipped on import
+    header = [
+        ":START_ID(Course)", ":END_ID(Course)", ":TYPE", "content:float", "difficulty:float"
+    ]
+    if _is_arrow_table(data["course_similarity"]):
+        with _raw_open(out_dir, "course_similarity.csv", "wb") as f:
+            _write_arrow_csv(f, data["course_similarity"], header,
+                             ["source", "target", None, "content", "difficulty"], "SIMILAR")
+    else:
+        with _raw_open(out_dir, "course_similarity.csv", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
             
-    with open(os.path.join(output_dir, "course_similarity_difficulty.csv"), "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            ":START_ID(Course)", ":END_ID(Course)", ":TYPE", "similarity:float"
-        ])
-        
-        for sim in data["similarity_difficulty"]:
-            writer.writerow([
-                sim["source"],
-                sim["target"],
-                "SIMILAR_DIFFICULTY",
-                sim["similarity"]
-            ])
+            for sim in data["course_similarity"]:
+                writer.writerow([
+                    sim["source"],
+                    sim["target"],
+                    "SIMILAR",
+                    sim["content"],
+                    sim["difficulty"]
+                ])
     
     # 10. Export relationship: Student-Degree
-    with open(os.path.join(output_dir, "student_degree.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "student_degree.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Student)", ":END_ID(Degree)", ":TYPE"
@@ -1879,7 +2022,7 @@ def export_to_csv(data, output_dir):
             ])
             
     # 11. Export relationship: Faculty-Course
-    with open(os.path.join(output_dir, "teaching.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "teaching.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Faculty)", ":END_ID(Course)", ":TYPE", "terms"
@@ -1894,28 +2037,37 @@ def export_to_csv(data, output_dir):
             ])
             
     # 12. Export relationship: Student-Course (Completed)
-    with open(os.path.join(output_dir, "completed_courses.csv"), "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            ":START_ID(Student)", ":END_ID(Course)", ":TYPE", "term", "grade",
-            "difficulty:int", "timeSpent:int", "instructionMode", "enjoyment:boolean"
-        ])
-        
-        for comp in data["completed_courses"]:
-            writer.writerow([
-                comp["studentId"],
-                comp["courseId"],
-                "COMPLETED",
-                comp["term"],
-                comp["grade"],
-                comp["difficulty"],
-                comp["timeSpent"],
-                comp["instructionMode"],
-                "true" if comp["enjoyment"] else "false"
-            ])
+    header = [
+        ":START_ID(Student)", ":END_ID(Course)", ":TYPE", "term", "grade", "gradeCode:int",
+        "difficulty:int", "timeSpent:int", "instructionMode", "enjoyment:boolean"
+    ]
+    if _is_arrow_table(data["completed_courses"]):
+        with _raw_open(out_dir, "completed_courses.csv", "wb") as f:
+            _write_arrow_csv(f, data["completed_courses"], header, [
+                "studentId", "courseId", None, "term", "grade", "gradeCode",
+                "difficulty", "timeSpent", "instructionMode", "enjoyment"
+            ], "COMPLETED")
+    else:
+        with _raw_open(out_dir, "completed_courses.csv", newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            
+            for comp in data["completed_courses"]:
+                writer.writerow([
+                    comp["studentId"],
+                    comp["courseId"],
+                    "COMPLETED",
+                    comp["term"],
+                    comp["grade"],
+                    comp["gradeCode"],
+                    comp["difficulty"],
+                    comp["timeSpent"],
+                    comp["instructionMode"],
+                    _BOOL_STR[comp["enjoyment"]]
+                ])
             
     # 13. Export relationship: Student-Course (Enrolled)
-    with open(os.path.join(output_dir, "enrolled_courses.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "enrolled_courses.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Student)", ":END_ID(Course)", ":TYPE"
@@ -1929,7 +2081,7 @@ def export_to_csv(data, output_dir):
             ])
             
     # 14. Export relationship: Student similarity
-    with open(os.path.join(output_dir, "learning_style_similarity.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "learning_style_similarity.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Student)", ":END_ID(Student)", ":TYPE", "similarity:float"
@@ -1943,7 +2095,7 @@ def export_to_csv(data, output_dir):
                 sim["similarity"]
             ])
             
-    with open(os.path.join(output_dir, "performance_similarity.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "performance_similarity.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Student)", ":END_ID(Student)", ":TYPE", "similarity:float", "courses"
@@ -1959,7 +2111,7 @@ def export_to_csv(data, output_dir):
             ])
             
     # 15. Export relationship: Requirement Group - Degree
-    with open(os.path.join(output_dir, "requirement_degree.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "requirement_degree.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(RequirementGroup)", ":END_ID(Degree)", ":TYPE"
@@ -1973,7 +2125,7 @@ def export_to_csv(data, output_dir):
             ])
             
     # 16. Export relationship: Course - Requirement Group
-    with open(os.path.join(output_dir, "course_requirement.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "course_requirement.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Course)", ":END_ID(RequirementGroup)", ":TYPE"
@@ -1988,25 +2140,21 @@ def export_to_csv(data, output_dir):
                 ])
                 
     # 17. Export relationship: Course - Term
-    with open(os.path.join(output_dir, "course_term.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "course_term.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Course)", ":END_ID(Term)", ":TYPE"
         ])
         
-        for course in data["courses"]:
-            for term_type in course["termAvailability"]:
-                # For each matching term
-                for term in data["terms"]:
-                    if term["type"] == term_type:
-                        writer.writerow([
-                            course["id"],
-                            term["id"],
-                            "OFFERED_IN"
-                        ])
+        for offered in data["course_terms"]:
+            writer.writerow([
+                offered["courseId"],
+                offered["termId"],
+                "OFFERED_IN"
+            ])
     
     # Export textbooks
-    with open(os.path.join(output_dir, "textbooks.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "textbooks.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             "id:ID(Textbook)", "name", "publisher", "price:float", "pages:int",
@@ -2027,7 +2175,7 @@ def export_to_csv(data, output_dir):
             ])
     
     # Export course-textbook relationships
-    with open(os.path.join(output_dir, "course_textbooks.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "course_textbooks.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Course)", ":END_ID(Textbook)", ":TYPE",
@@ -2044,7 +2192,7 @@ def export_to_csv(data, output_dir):
             ])
     
     # Export textbook page views
-    with open(os.path.join(output_dir, "page_views.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "page_views.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Student)", ":END_ID(Textbook)", ":TYPE",
@@ -2063,7 +2211,7 @@ def export_to_csv(data, output_dir):
             ])
     
     # Export textbook interactions
-    with open(os.path.join(output_dir, "textbook_interactions.csv"), "w", newline='') as f:
+    with _raw_open(out_dir, "textbook_interactions.csv", newline='') as f:
         writer = csv.writer(f)
         writer.writerow([
             ":START_ID(Student)", ":END_ID(Textbook)", ":TYPE",
@@ -2081,6 +2229,54 @@ def export_to_csv(data, output_dir):
                 interaction["duration"]
             ])
 
+def _jsonl_line(record):
+    """
+    Serialize a single record as one JSON Lines row (bytes, newline-terminated).
+    """
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def export_to_jsonl(data, output_dir):
+    """
+    Export the completed course records to JSON Lines for loading with APOC.
+    
+    JSON serialization is much cheaper than CSV quoting for the largest
+    relationship set, and apoc.load.json reads JSONL files directly.
+    """
+    out_dir = _open_output_dir(output_dir)
+    try:
+        _write_jsonl_files(data, out_dir)
+    finally:
+        _close_output_dir(out_dir)
+
+def _write_jsonl_files(data, out_dir):
+    """
+    Write the JSON Lines files inside an open output directory.
+    """
+    # Student-Course (Completed) records, one JSON object per line
+    with _raw_open(out_dir, "completed_courses.jsonl", "wb") as f:
+        f.writelines(_jsonl_line(comp) for comp in _iter_records(data["completed_courses"]))
+    
+    # Companion Cypher that creates the COMPLETED relationships from the JSONL file
+    with _raw_open(out_dir, "load_completed_courses.cypher") as f:
+        f.write("""
+// Copy completed_courses.jsonl into the Neo4j import directory before running.
+// Requires the APOC plugin.
+CALL apoc.load.json("file:///completed_courses.jsonl") YIELD value
+UNWIND [value] AS r
+MATCH (s:Student {id: r.studentId}), (c:Course {id: r.courseId})
+CREATE (s)-[:COMPLETED {
+    term: r.term,
+    grade: r.grade,
+    gradeCode: r.gradeCode,
+    difficulty: r.difficulty,
+    timeSpent: r.timeSpent,
+    instructionMode: r.instructionMode,
+    enjoyment: r.enjoyment
+}]->(c);
+""")
+
 def generate_neo4j_import_script(output_dir):
     """
     Generate a shell script to import the CSV files into Neo4j.
@@ -2106,6 +2302,9 @@ DB_NAME="umbc-degree-pathways"
 # Path to the import directory (absolute path)
 IMPORT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
+# Number of importer threads (nproc on Linux, sysctl on macOS)
+THREADS="$(nproc 2>/dev/null || sysctl -n hw.ncpu)"
+
 # Check if Neo4j is running
 if pgrep -x "neo4j" > /dev/null; then
     echo "Error: Neo4j appears to be running. Please stop Neo4j before running this import script."
@@ -2122,7 +2321,7 @@ fi
 required_files=(
     "students.csv" "faculty.csv" "courses.csv" "degrees.csv" "terms.csv"
     "requirement_groups.csv" "textbooks.csv" "prerequisites.csv" "leads_to.csv"
-    "course_similarity_content.csv" "course_similarity_difficulty.csv"
+    "course_similarity.csv"
     "student_degree.csv" "teaching.csv" "completed_courses.csv"
     "enrolled_courses.csv" "learning_style_similarity.csv"
     "performance_similarity.csv" "requirement_degree.csv"
@@ -2141,6 +2340,7 @@ echo "Starting import process..."
 echo "Using Neo4j installation at: $NEO4J_HOME"
 echo "Importing from directory: $IMPORT_DIR"
 echo "Target database name: $DB_NAME"
+echo "Importer threads: $THREADS"
 
 # Clean up any existing database files
 DB_PATH="$NEO4J_HOME/data/databases/$DB_NAME"
@@ -2162,8 +2362,7 @@ echo "Creating fresh database..."
   --nodes="Textbook=$IMPORT_DIR/textbooks.csv" \\
   --relationships="PREREQUISITE_FOR=$IMPORT_DIR/prerequisites.csv" \\
   --relationships="LEADS_TO=$IMPORT_DIR/leads_to.csv" \\
-  --relationships="SIMILAR_CONTENT=$IMPORT_DIR/course_similarity_content.csv" \\
-  --relationships="SIMILAR_DIFFICULTY=$IMPORT_DIR/course_similarity_difficulty.csv" \\
+  --relationships="SIMILAR=$IMPORT_DIR/course_similarity.csv" \\
   --relationships="PURSUING=$IMPORT_DIR/student_degree.csv" \\
   --relationships="TEACHES=$IMPORT_DIR/teaching.csv" \\
   --relationships="COMPLETED=$IMPORT_DIR/completed_courses.csv" \\
@@ -2183,6 +2382,10 @@ echo "Creating fresh database..."
   --skip-bad-relationships=true \\
   --skip-duplicate-nodes=true \\
   --high-parallel-io=on \\
+  --threads="$THREADS" \\
+  --max-off-heap-memory=80% \\
+  --read-buffer-size=16m \\
+  --verbose \\
   --normalize-types=true \\
   --overwrite-destination=true \\
   "$DB_NAME"
@@ -2216,7 +2419,8 @@ This directory contains:
 1. Cypher scripts (`*.cypher`) for creating the database incrementally
 2. CSV files for bulk import
 3. `import_to_neo4j.sh` script for bulk import
-4. This README file
+4. JSON Lines files (`jsonl/`) with a companion Cypher script for APOC loading
+5. This README file
 
 ## Data Model
 
@@ -2227,7 +2431,7 @@ The database follows this graph model:
   - Student-Course: COMPLETED, ENROLLED_IN
   - Student-Degree: PURSUING
   - Student-Student: SIMILAR_LEARNING_STYLE, SIMILAR_PERFORMANCE
-  - Course-Course: PREREQUISITE_FOR, LEADS_TO, SIMILAR_CONTENT, SIMILAR_DIFFICULTY
+  - Course-Course: PREREQUISITE_FOR, LEADS_TO, SIMILAR
   - Faculty-Course: TEACHES
   - RequirementGroup-Degree: PART_OF
   - Course-RequirementGroup: FULFILLS
@@ -2250,6 +2454,12 @@ cat 00_indexes.cypher 01_students.cypher 02_faculty.cypher [...] | bin/cypher-sh
 3. Run the script: `./import_to_neo4j.sh`
 4. Update your neo4j.conf to use the imported database
 
+### Option 3: APOC JSON Lines Load
+
+Copy `jsonl/completed_courses.jsonl` into the Neo4j import directory and run
+`jsonl/load_completed_courses.cypher` (requires the APOC plugin) after the
+node scripts have been loaded.
+
 ## Sample Queries
 
 See the accompanying documentation for sample queries that demonstrate using
@@ -2509,6 +2719,10 @@ def main():
     
     print("Generating course similarity...")
     similarity_content, similarity_difficulty = generate_course_similarity(courses)
+    course_similarity = merge_course_similarity(similarity_content, similarity_difficulty)
+    
+    print("Generating course-term relationships...")
+    course_terms = generate_course_term_relationships(courses, terms)
     
     print("Generating student-degree relationships...")
     student_degree = generate_student_degree_relationships(students, degrees)
@@ -2527,6 +2741,12 @@ def main():
     print("Generating student similarity...")
     learning_style_similarity, performance_similarity = generate_student_similarity(students, completed_courses)
     
+    # With pyarrow, the largest relationship set is written by Arrow's CSV writer.
+    # The generators above still need the rows as dicts, so this only speeds up
+    # the CSV export; it doesn't lower peak memory
+    if pa is not None:
+        completed_courses = pa.Table.from_pylist(completed_courses)
+    
     # Combine all data
     data = {
         "students": students,
@@ -2541,8 +2761,8 @@ def main():
         "requirement_groups": requirement_groups,
         "prerequisites": prerequisites,
         "leads_to": leads_to,
-        "similarity_content": similarity_content,
-        "similarity_difficulty": similarity_difficulty,
+        "course_similarity": course_similarity,
+        "course_terms": course_terms,
         "student_degree": student_degree,
         "teaching": teaching,
         "completed_courses": completed_courses,
@@ -2556,6 +2776,7 @@ def main():
     
     cypher_dir = os.path.join(OUTPUT_DIR, "cypher")
     csv_dir = os.path.join(OUTPUT_DIR, "csv")
+    jsonl_dir = os.path.join(OUTPUT_DIR, "jsonl")
     
     print("Exporting Cypher scripts...")
     export_to_cypher(data, cypher_dir)
@@ -2563,6 +2784,9 @@ def main():
     print("Exporting CSV files...")
     export_to_csv(data, csv_dir)
     
+    print("Exporting JSONL files...")
+    export_to_jsonl(data, jsonl_dir)
+    
     print("Generating Neo4j import script...")
     generate_neo4j_import_script(csv_dir)
     
@@ -2590,6 +2814,7 @@ def main():
     print(f"\nOutput files written to {OUTPUT_DIR}")
     print("- Cypher scripts: ./cypher/")
     print("- CSV files: ./csv/")
+    print("- JSONL files: ./jsonl/")
     print("- Import script: ./csv/import_to_neo4j.sh")
     print("- README: ./README.md")
     print("- Browser Guide: ./umbc_guide.html")
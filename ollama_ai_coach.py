@@ -1,10 +1,166 @@
 from neo4j import GraphDatabase
+import bisect
+from collections import Counter, namedtuple
+import functools
+import hashlib
+from itertools import repeat
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import random
 import numpy as np
 
+# orjson is optional; fall back to the stdlib decoder when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decoder for Ollama's streamed JSON lines (both accept bytes)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Minimum completed courses for a student to be analyzed
+MIN_COMPLETED_COURSES = 3
+
+# Gaps to peers above which a student gets GPA / course-load recommendations
+GPA_GAP_THRESHOLD = 0.1
+COURSE_GAP_THRESHOLD = 1
+
+# Seconds to stop calling Ollama after a failed request
+OLLAMA_RETRY_SECONDS = 30
+
+# Stop reading a streamed Ollama response after this many characters
+MAX_INSIGHT_CHARS = 600
+
+# Number of distinct analysis buckets whose AI insights are kept in memory
+INSIGHT_CACHE_SIZE = 512
+
+# SQLite file that keeps generated insights across runs; kept next to this module
+# so it doesn't depend on the working directory
+INSIGHT_CACHE_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_insights.db")
+
+# Grade points lookup table; _POINTS_ARR holds the points in the same order.
+# The order matches the gradeCode stored on COMPLETED by generate_synthetic_dataset.py
+_GRADE_LUT = {
+    'A': 4.0, 'A-': 3.7, 'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7, 'D+': 1.3, 'D': 1.0, 'F': 0.0, 'W': 0.0
+}
+_POINTS_ARR = np.array(list(_GRADE_LUT.values()), dtype=np.float64)
+_GP_GET = _GRADE_LUT.get
+
+# Cypher expression mapping a COMPLETED relationship `c` to grade points
+_GRADE_POINTS_CYPHER = (
+    "CASE c.grade "
+    + " ".join(f"WHEN '{grade}' THEN {points}" for grade, points in _GRADE_LUT.items())
+    + " ELSE 0.0 END"
+)
+
+# Cypher expression mapping a COMPLETED relationship `c` to its index in _POINTS_ARR.
+# Reads the stored gradeCode, falling back to c.grade on graphs imported before
+# gradeCode existed; unknown grades count as an F
+_GRADE_CODE_CYPHER = (
+    "coalesce(c.gradeCode, CASE c.grade "
+    + " ".join(f"WHEN '{grade}' THEN {code}" for code, grade in enumerate(_GRADE_LUT))
+    + f" ELSE {list(_GRADE_LUT).index('F')} END)"
+)
+
+# Cypher list counting the rows per `gradeCode` (see _GRADE_CODE_CYPHER)
+_GRADE_HIST_CYPHER = "[" + ", ".join(
+    f"sum(CASE gradeCode WHEN {code} THEN 1 ELSE 0 END)" for code in range(len(_GRADE_LUT))
+) + "]"
+
+# Queries are fixed strings so Neo4j can reuse their cached plans
+_Q_STUDENT_ID_CONSTRAINT = (
+    "CREATE CONSTRAINT student_id IF NOT EXISTS FOR (s:Student) REQUIRE s.id IS UNIQUE"
+)
+
+_Q_ELIGIBLE_IDS = """
+MATCH (s:Student)-[c:COMPLETED]->()
+WITH s, count(c) as courseCount
+WHERE courseCount >= $min_courses
+RETURN collect(s.id) as ids
+"""
+
+# Target student columns, with GPA and course count computed in Cypher
+_STUDENT_RETURN_CYPHER = f"""
+RETURN s.id as id, s.name as name, s.learningStyle as learningStyle,
+       s.preferredPace as preferredPace,
+       collect(c.grade) as grades,
+       collect(course.name) as courseNames,
+       count(c) as targetCourses,
+       avg({_GRADE_POINTS_CYPHER}) as targetGpa
+"""
+
+_Q_RANDOM_STUDENT = """
+MATCH (s:Student {id: $student_id})-[c:COMPLETED]->(course:Course)""" + _STUDENT_RETURN_CYPHER
+
+_Q_STUDENTS_BY_ID = """
+UNWIND $student_ids as sid
+MATCH (s:Student {id: sid})-[c:COMPLETED]->(course:Course)""" + _STUDENT_RETURN_CYPHER
+
+_Q_SIMILAR_STUDENTS = f"""
+MATCH (s:Student)-[c:COMPLETED]->(course:Course)
+WHERE s.learningStyle = $learningStyle
+WITH s, {_GRADE_CODE_CYPHER} as gradeCode
+WITH s, {_GRADE_HIST_CYPHER} as gradeHist, count(*) as courseCount
+WHERE courseCount >= $min_courses
+RETURN s.name as name, s.learningStyle as learningStyle,
+       s.preferredPace as preferredPace, gradeHist, courseCount
+LIMIT 10
+"""
+
+_Q_PEER_STATS = f"""
+MATCH (s:Student)-[c:COMPLETED]->()
+WITH s, count(c) as courseCount, avg({_GRADE_POINTS_CYPHER}) as gpa
+WHERE courseCount >= $min_courses
+RETURN s.learningStyle as learningStyle, avg(gpa) as avgGpa,
+       avg(courseCount) as avgCourses, collect(gpa) as gpas
+"""
+
+# Compact prompt: fewer input tokens means a shorter prefill
+_OLLAMA_PROMPT_TMPL = (
+    "Advise {preferred_pace}-paced {learning_style} learner. "
+    "GPA {target_gpa:.1f}/{similar_avg_gpa:.1f}, "
+    "courses {target_courses}/{similar_avg_courses:.0f}, "
+    "beat_by {better_ratio:.0%}. Give 3 bullets, <60 words."
+)
+
+_OLLAMA_OPTIONS = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "repeat_penalty": 1.1,
+    # Room for three short bullets; the compact prompt fits well inside num_ctx
+    "num_predict": 120,
+    "num_ctx": 512,
+    # Stop if the model starts a fourth bullet; line-anchored so GPAs like "4.0" don't match
+    "stop": ["\n4."]
+}
+
+# A peer returned by find_similar_students; grade_hist counts courses per grade code
+PeerRow = namedtuple('PeerRow', 'name learningStyle preferredPace grade_hist courseCount')
+
+def _read_records(tx, query, **params):
+    """Run a query in a read transaction function and materialize its records"""
+    return list(tx.run(query, **params))
+
+def _student_from_record(record):
+    """Split a target student record into the student dict, GPA and course count"""
+    student = {key: record[key] for key in
+               ('id', 'name', 'learningStyle', 'preferredPace', 'grades', 'courseNames')}
+    return student, record['targetGpa'], record['targetCourses']
+
+def gpa_from_histogram(grade_hist):
+    """Calculate GPA from per-grade-code course counts"""
+    total = grade_hist.sum()
+    return float(grade_hist @ _POINTS_ARR / total) if total else 0.0
+
 class OllamaAIStudyCoach:
-    def __init__(self, model_name="llama2"):
+    def __init__(self, model_name="llama2", cache_db=INSIGHT_CACHE_DB):
         # Neo4j connection
         self.driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "yourpassword"))
         
@@ -12,20 +168,47 @@ class OllamaAIStudyCoach:
         self.ollama_url = "http://localhost:11434/api/generate"
         self.model_name = model_name
         
+        # Ollama is probed on first use; after a failure it is skipped until _ollama_fail_until
+        self._ollama_ok = None
+        self._ollama_fail_until = 0.0
+        
+        # Reuse keep-alive connections to Ollama across requests
+        self._http = requests.Session()
+        self._http.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0))
+        
+        # Insights are cached per bucketed analysis (see _insight_key), in memory and on disk
+        self._cache_db = sqlite3.connect(cache_db, check_same_thread=False)
+        self._cache_db.execute("CREATE TABLE IF NOT EXISTS insights (k TEXT PRIMARY KEY, v TEXT)")
+        self._cache_lock = threading.Lock()
+        self._generate_cached = functools.lru_cache(maxsize=INSIGHT_CACHE_SIZE)(self._stored_insight)
+        
+        # Ids of students eligible for analysis, loaded on first use
+        self._eligible_ids = None
+        
+        # Per-learning-style peer statistics, loaded on first use
+        self._peer_stats = None
+        
+        # In-memory peer lists by learning style, so repeat lookups skip the graph scan
+        self._similar_students = {}
+        
+        # How many insights came from Ollama vs. were skipped for negligible gaps
+        self.insight_counts = Counter()
+        
+        # Worker threads for overlapping independent Neo4j/Ollama calls
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        
         print(f"Initializing AI Study Coach with Ollama model: {model_name}")
         
-        # Test Ollama connection
+        # Make sure student lookups by id are index-backed
         try:
-            self.test_ollama_connection()
-            print("Ollama connection successful!")
+            self.ensure_indexes()
         except Exception as e:
-            print(f"Warning: Ollama connection failed: {e}")
-            print("Make sure Ollama is running and the model is pulled")
+            print(f"Warning: Could not create Neo4j indexes: {e}")
 
     def test_ollama_connection(self):
         """Test if Ollama is running and model is available"""
         test_prompt = "Hello"
-        response = requests.post(self.ollama_url, json={
+        response = self._http.post(self.ollama_url, json={
             "model": self.model_name,
             "prompt": test_prompt,
             "stream": False
@@ -36,58 +219,133 @@ class OllamaAIStudyCoach:
         
         return True
 
+    def ensure_indexes(self):
+        """Create the Student id constraint used for id lookups"""
+        with self.driver.session() as session:
+            session.run(_Q_STUDENT_ID_CONSTRAINT).consume()
+
+    def _get_eligible_ids(self, session):
+        """Get (and cache) the ids of students with enough completed courses"""
+        if self._eligible_ids is not None:
+            return self._eligible_ids
+        records = session.execute_read(_read_records, _Q_ELIGIBLE_IDS,
+                                       min_courses=MIN_COMPLETED_COURSES)
+        eligible_ids = records[0]['ids'] if records else []
+        # An empty graph (e.g. before the import) isn't cached, so later calls look again
+        if eligible_ids:
+            self._eligible_ids = eligible_ids
+        return eligible_ids
+
     def get_random_student(self):
         """Get a random student with course data"""
         with self.driver.session() as session:
-            query = """
-            MATCH (s:Student)-[c:COMPLETED]->(course:Course)
-            WITH s, count(c) as courseCount
-            WHERE courseCount >= 3
-            WITH s ORDER BY rand() LIMIT 1
-            MATCH (s)-[c:COMPLETED]->(course:Course)
-            RETURN s.id as id, s.name as name, s.learningStyle as learningStyle, 
-                   s.preferredPace as preferredPace,
-                   collect(c.grade) as grades,
-                   collect(course.name) as courseNames
-            """
-            result = session.run(query)
-            record = result.single()
-            return dict(record) if record else None
+            student, _, _ = self._fetch_random_student(session)
+            return student
 
     def find_similar_students(self, target_learning_style):
         """Find students with similar learning style and their performance"""
+        similar_students = self._similar_students.get(target_learning_style)
+        if similar_students is not None:
+            return similar_students
+        
         with self.driver.session() as session:
-            query = """
-            MATCH (s:Student)-[c:COMPLETED]->(course:Course)
-            WHERE s.learningStyle = $learningStyle
-            WITH s, collect(c.grade) as grades, count(c) as courseCount
-            WHERE courseCount >= 3
-            RETURN s.name as name, s.learningStyle as learningStyle,
-                   s.preferredPace as preferredPace, grades, courseCount
-            LIMIT 10
-            """
-            result = session.run(query, learningStyle=target_learning_style)
-            return [dict(record) for record in result]
+            records = session.execute_read(_read_records, _Q_SIMILAR_STUDENTS,
+                                           learningStyle=target_learning_style,
+                                           min_courses=MIN_COMPLETED_COURSES)
+        
+        # Neo4j returns per-grade counts rather than every grade, so GPA is a dot product
+        similar_students = [
+            PeerRow(record['name'], record['learningStyle'], record['preferredPace'],
+                    np.array(record['gradeHist'], dtype=np.int32), record['courseCount'])
+            for record in records
+        ]
+        self._similar_students[target_learning_style] = similar_students
+        return similar_students
 
-    def calculate_gpa(self, grades):
-        """Calculate GPA from grades"""
-        grade_points = {
-            'A': 4.0, 'A-': 3.7, 'B+': 3.3, 'B': 3.0, 'B-': 2.7,
-            'C+': 2.3, 'C': 2.0, 'C-': 1.7, 'D+': 1.3, 'D': 1.0, 'F': 0.0
+    def _get_peer_stats(self, session):
+        """Get (and cache) GPA statistics for all eligible students by learning style"""
+        if self._peer_stats is None:
+            records = session.execute_read(_read_records, _Q_PEER_STATS,
+                                           min_courses=MIN_COMPLETED_COURSES)
+            self._peer_stats = {
+                record['learningStyle']: {
+                    'avg_gpa': record['avgGpa'],
+                    'avg_courses': record['avgCourses'],
+                    'gpas_sorted': sorted(record['gpas'])
+                }
+                for record in records
+            }
+        return self._peer_stats
+
+    def _load_peer_stats(self):
+        """Get the cached peer statistics, opening a session if they need loading"""
+        if self._peer_stats is not None:
+            return self._peer_stats
+        with self.driver.session() as session:
+            return self._get_peer_stats(session)
+
+    def refresh_peer_stats(self):
+        """Drop cached student ids, peer lists and peer statistics after the graph changes"""
+        self._eligible_ids = None
+        self._peer_stats = None
+        self._similar_students.clear()
+
+    def _compare_with_peer_stats(self, stats, target_student, target_gpa, target_courses):
+        """Build the performance analysis from cached learning-style statistics"""
+        gpas = stats['gpas_sorted']
+        return {
+            'target_gpa': target_gpa,
+            'target_courses': target_courses,
+            'similar_avg_gpa': stats['avg_gpa'],
+            'similar_avg_courses': stats['avg_courses'],
+            # The epsilon keeps the student from outranking their own Cypher-computed GPA
+            'better_performers_count': len(gpas) - bisect.bisect_right(gpas, target_gpa + 1e-9),
+            'total_similar_count': len(gpas),
+            'learning_style': target_student['learningStyle'],
+            'preferred_pace': target_student['preferredPace']
         }
+
+    def _fetch_random_student(self, session):
+        """Get a random student along with their GPA and course count computed in Cypher"""
+        eligible_ids = self._get_eligible_ids(session)
+        if not eligible_ids:
+            return None, None, None
+        
+        records = session.execute_read(_read_records, _Q_RANDOM_STUDENT,
+                                       student_id=random.choice(eligible_ids))
+        if not records:
+            return None, None, None
+        
+        return _student_from_record(records[0])
+
+    def calculate_gpa(self, grades):
+        """Calculate GPA from grade letters"""
         if not grades:
             return 0.0
-        points = [grade_points.get(grade, 0.0) for grade in grades]
-        return sum(points) / len(points)
+        # Unknown grades count as 0.0 points. A student's letter list is short enough
+        # that summing lookups beats building an array
+        return sum(map(_GP_GET, grades, repeat(0.0))) / len(grades)
 
-    def analyze_performance(self, target_student, similar_students):
-        """Analyze performance compared to similar students"""
+    def analyze_performance(self, target_student, similar_students=None):
+        """Analyze performance compared to similar students
+        
+        An explicit peer list is a list of PeerRow from find_similar_students.
+        Without one, the student is compared against the
+        cached statistics for every student with the same learning style.
+        """
         target_gpa = self.calculate_gpa(target_student['grades'])
         target_courses = len(target_student['grades'])
         
+        if similar_students is None:
+            with self.driver.session() as session:
+                stats = self._get_peer_stats(session).get(target_student['learningStyle'])
+            if stats:
+                return self._compare_with_peer_stats(stats, target_student, target_gpa, target_courses)
+            similar_students = []
+        
         # Calculate stats for similar students
-        similar_gpas = [self.calculate_gpa(s['grades']) for s in similar_students]
-        similar_courses = [s['courseCount'] for s in similar_students]
+        similar_gpas = [gpa_from_histogram(s.grade_hist) for s in similar_students]
+        similar_courses = [s.courseCount for s in similar_students]
         
         # Find better performers
         better_performers = [gpa for gpa in similar_gpas if gpa > target_gpa]
@@ -95,8 +353,8 @@ class OllamaAIStudyCoach:
         analysis = {
             'target_gpa': target_gpa,
             'target_courses': target_courses,
-            'similar_avg_gpa': np.mean(similar_gpas) if similar_gpas else 0.0,
-            'similar_avg_courses': np.mean(similar_courses) if similar_courses else 0,
+            'similar_avg_gpa': sum(similar_gpas) / len(similar_gpas) if similar_gpas else 0.0,
+            'similar_avg_courses': sum(similar_courses) / len(similar_courses) if similar_courses else 0,
             'better_performers_count': len(better_performers),
             'total_similar_count': len(similar_students),
             'learning_style': target_student['learningStyle'],
@@ -105,56 +363,101 @@ class OllamaAIStudyCoach:
         
         return analysis
 
+    def _insight_key(self, analysis):
+        """Bucket the analysis fields that determine the Ollama prompt"""
+        total = analysis['total_similar_count']
+        better_ratio = analysis['better_performers_count'] / total if total else 0.0
+        return (
+            analysis['learning_style'],
+            analysis['preferred_pace'],
+            round(analysis['target_gpa'], 1),
+            5 * round(analysis['target_courses'] / 5),
+            round(analysis['similar_avg_gpa'], 1),
+            5 * round(analysis['similar_avg_courses'] / 5),
+            round(better_ratio, 1)
+        )
+
+    def _needs_ai_insight(self, analysis):
+        """Check whether the gaps to peers are worth an Ollama call, counting the outcome"""
+        gpa_gap = analysis['similar_avg_gpa'] - analysis['target_gpa']
+        course_gap = analysis['similar_avg_courses'] - analysis['target_courses']
+        needed = gpa_gap > GPA_GAP_THRESHOLD or course_gap > COURSE_GAP_THRESHOLD
+        self.insight_counts['ollama' if needed else 'skipped'] += 1
+        return needed
+
     def generate_ollama_insights(self, analysis):
-        """Generate AI insights using Ollama"""
+        """Generate AI insights using Ollama, reusing results for similar analyses"""
         try:
-            learning_style = analysis['learning_style']
-            gpa_diff = analysis['similar_avg_gpa'] - analysis['target_gpa']
-            course_diff = analysis['similar_avg_courses'] - analysis['target_courses']
-            
-            # Create a detailed prompt for Ollama
-            prompt = f"""You are an academic advisor AI. A {learning_style} learning style student needs study advice.
-
-Student Profile:
-- Learning Style: {learning_style}
-- Current GPA: {analysis['target_gpa']:.2f}
-- Courses Completed: {analysis['target_courses']}
-- Preferred Pace: {analysis['preferred_pace']}
-
-Comparison with Similar Students:
-- Similar students average GPA: {analysis['similar_avg_gpa']:.2f}
-- GPA gap: {gpa_diff:.2f} points
-- Similar students average courses: {analysis['similar_avg_courses']:.1f}
-- Course gap: {course_diff:.1f} courses
-- Better performers: {analysis['better_performers_count']}/{analysis['total_similar_count']}
-
-Provide 2-3 specific, actionable study recommendations for this {learning_style} learner. Focus on practical advice that addresses their performance gaps. Keep response under 100 words."""
-
-            # Call Ollama API
-            response = requests.post(self.ollama_url, json={
-                "model": self.model_name,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "max_tokens": 150
-                }
-            }, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get('response', '').strip()
-            else:
-                print(f"Ollama API error: {response.status_code}")
-                return self.get_fallback_advice(learning_style)
-                
+            return self._generate_cached(*self._insight_key(analysis))
         except Exception as e:
             print(f"Ollama generation error: {e}")
             return self.get_fallback_advice(analysis['learning_style'])
 
+    def _stored_insight(self, *key):
+        """Get an insight from the on-disk cache, generating and storing it on a miss"""
+        digest = hashlib.blake2b(repr((self.model_name,) + key).encode(), digest_size=16).hexdigest()
+        with self._cache_lock:
+            row = self._cache_db.execute("SELECT v FROM insights WHERE k = ?", (digest,)).fetchone()
+        if row:
+            return row[0]
+        
+        if time.monotonic() < self._ollama_fail_until:
+            raise Exception("Ollama unavailable after a recent failure, retrying later")
+        try:
+            if not self._ollama_ok:
+                self.test_ollama_connection()
+                self._ollama_ok = True
+            insight = self._generate_insight(*key)
+        except Exception:
+            # Don't wait on another timeout for every request while Ollama is down
+            self._ollama_ok = False
+            self._ollama_fail_until = time.monotonic() + OLLAMA_RETRY_SECONDS
+            raise
+        
+        with self._cache_lock, self._cache_db:
+            self._cache_db.execute("INSERT OR REPLACE INTO insights (k, v) VALUES (?, ?)",
+                                   (digest, insight))
+        return insight
+
+    def _generate_insight(self, learning_style, preferred_pace, target_gpa, target_courses,
+                          similar_avg_gpa, similar_avg_courses, better_ratio):
+        """Call Ollama for a bucketed analysis; raises on failure so errors aren't cached"""
+        prompt = _OLLAMA_PROMPT_TMPL.format_map({
+            'learning_style': learning_style,
+            'preferred_pace': preferred_pace,
+            'target_gpa': target_gpa,
+            'target_courses': target_courses,
+            'similar_avg_gpa': similar_avg_gpa,
+            'similar_avg_courses': similar_avg_courses,
+            'better_ratio': better_ratio
+        })
+
+        # Call Ollama API, streaming so we can stop once we have enough text
+        with self._http.post(self.ollama_url, json={
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": True,
+            "options": _OLLAMA_OPTIONS
+        }, stream=True, timeout=30) as response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code}")
+            
+            parts = []
+            length = 0
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = _json_loads(line)
+                part = chunk.get('response', '')
+                parts.append(part)
+                length += len(part)
+                if chunk.get('done') or length > MAX_INSIGHT_CHARS:
+                    break
+            
+            return ''.join(parts).strip()
+
     def get_fallback_advice(self, learning_style):
-        """Fallback advice if Ollama fails"""
+        """Fallback advice if Ollama fails or is unavailable"""
         fallback_advice = {
             'Visual': 'Create visual study aids like diagrams, charts, and mind maps. Use color coding and visual organization for notes.',
             'Auditory': 'Form study groups, record lectures, and explain concepts aloud. Use verbal mnemonics and discussion-based learning.',
@@ -169,7 +472,7 @@ Provide 2-3 specific, actionable study recommendations for this {learning_style}
         
         # GPA recommendation
         gpa_gap = analysis['similar_avg_gpa'] - analysis['target_gpa']
-        if gpa_gap > 0.1:
+        if gpa_gap > GPA_GAP_THRESHOLD:
             recommendations.append({
                 'category': 'Academic Performance',
                 'priority': 'high' if gpa_gap > 0.3 else 'medium',
@@ -180,7 +483,7 @@ Provide 2-3 specific, actionable study recommendations for this {learning_style}
         
         # Course load recommendation
         course_gap = analysis['similar_avg_courses'] - analysis['target_courses']
-        if course_gap > 1:
+        if course_gap > COURSE_GAP_THRESHOLD:
             recommendations.append({
                 'category': 'Course Planning',
                 'priority': 'medium',
@@ -210,32 +513,29 @@ Provide 2-3 specific, actionable study recommendations for this {learning_style}
     def get_recommendations(self):
         """Main method to get AI-powered study recommendations"""
         try:
+            # Load peer statistics (instant once cached) while the student is fetched
+            peer_stats_future = self._executor.submit(self._load_peer_stats)
+            
             # Get a random student
-            student = self.get_random_student()
+            with self.driver.session() as session:
+                student, target_gpa, target_courses = self._fetch_random_student(session)
             if not student:
                 return {"error": "No student data found"}
             
-            # Find similar students
-            similar_students = self.find_similar_students(student['learningStyle'])
-            if not similar_students:
+            # Compare with similar students
+            stats = peer_stats_future.result().get(student['learningStyle'])
+            if not stats:
                 return {"error": "No similar students found"}
             
-            # Analyze performance
-            analysis = self.analyze_performance(student, similar_students)
-            
-            # Generate AI insights using Ollama
-            ai_insight = self.generate_ollama_insights(analysis)
+            analysis = self._compare_with_peer_stats(stats, student, target_gpa, target_courses)
             
-            # Create recommendations
-            recommendations = self.create_recommendations(analysis, ai_insight)
+            # Generate AI insights using Ollama, unless the student is already at or above their peers
+            if self._needs_ai_insight(analysis):
+                ai_insight = self.generate_ollama_insights(analysis)
+            else:
+                ai_insight = self.get_fallback_advice(analysis['learning_style'])
             
-            return {
-                'student': student,
-                'analysis': analysis,
-                'recommendations': recommendations,
-                'ai_insight': ai_insight,
-                'success': True
-            }
+            return self._build_result(student, analysis, ai_insight)
             
         except Exception as e:
             import traceback
@@ -243,7 +543,75 @@ Provide 2-3 specific, actionable study recommendations for this {learning_style}
             traceback.print_exc()
             return {"error": str(e)}
 
+    def batch_get_recommendations(self, student_ids):
+        """Get recommendations for many students with one Neo4j query
+        
+        Ollama calls for the batch run concurrently on the coach's worker
+        threads. Results are returned in the order of `student_ids`.
+        """
+        try:
+            peer_stats_future = self._executor.submit(self._load_peer_stats)
+            
+            with self.driver.session() as session:
+                records = session.execute_read(_read_records, _Q_STUDENTS_BY_ID,
+                                               student_ids=list(student_ids))
+            peer_stats = peer_stats_future.result()
+            
+            # Start the Ollama calls for every student before waiting on any of them
+            pending = {}
+            for record in records:
+                student, target_gpa, target_courses = _student_from_record(record)
+                stats = peer_stats.get(student['learningStyle'])
+                if not stats:
+                    pending[student['id']] = None
+                    continue
+                
+                analysis = self._compare_with_peer_stats(stats, student, target_gpa, target_courses)
+                if self._needs_ai_insight(analysis):
+                    insight = self._executor.submit(self.generate_ollama_insights, analysis)
+                else:
+                    insight = None
+                pending[student['id']] = (student, analysis, insight)
+            
+            results = []
+            for student_id in student_ids:
+                if student_id not in pending:
+                    results.append({"error": "No student data found"})
+                    continue
+                if pending[student_id] is None:
+                    results.append({"error": "No similar students found"})
+                    continue
+                
+                student, analysis, insight = pending[student_id]
+                if insight is None:
+                    ai_insight = self.get_fallback_advice(analysis['learning_style'])
+                else:
+                    ai_insight = insight.result()
+                results.append(self._build_result(student, analysis, ai_insight))
+            return results
+            
+        except Exception as e:
+            import traceback
+            print(f"Error: {e}")
+            traceback.print_exc()
+            return [{"error": str(e)} for _ in student_ids]
+
+    def _build_result(self, student, analysis, ai_insight):
+        """Assemble the recommendations response for one student"""
+        return {
+            'student': student,
+            'analysis': analysis,
+            'recommendations': self.create_recommendations(analysis, ai_insight),
+            'ai_insight': ai_insight,
+            'success': True
+        }
+
     def close(self):
+        self._executor.shutdown(wait=True)
+        self._generate_cached.cache_clear()
+        self._cache_db.close()
+        self._similar_students.clear()
+        self._http.close()
         self.driver.close()
 
 # Test the Ollama AI coach
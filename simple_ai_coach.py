@@ -1,134 +1,481 @@
-from neo4j import GraphDatabase
-from transformers import pipeline, GPT2LMHeadModel, GPT2Tokenizer
+from neo4j import AsyncGraphDatabase, GraphDatabase
+from collections import OrderedDict, namedtuple
+import asyncio
+import functools
+import os
+import random
+import threading
+import time
 import numpy as np
 
+# numba is optional; bulk GPA scoring falls back to NumPy when it isn't installed
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Number of distinct insight buckets whose generated text is kept in memory
+INSIGHT_CACHE_SIZE = 256
+
+# Seconds that a learning style's peer statistics are reused before Neo4j is queried again
+PEER_STATS_TTL = 300
+
+# Grade points lookup table; grades are mapped to indices into _POINTS_ARR
+_GRADE_LUT = {
+    'A': 4.0, 'A-': 3.7, 'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7, 'D+': 1.3, 'D': 1.0, 'F': 0.0
+}
+_GRADE_IDX = {grade: i for i, grade in enumerate(_GRADE_LUT)}
+_POINTS_ARR = np.array(list(_GRADE_LUT.values()), dtype=np.float64)
+
+# Cypher expression mapping a COMPLETED relationship `c` to grade points
+_GRADE_POINTS_CYPHER = (
+    "CASE c.grade "
+    + " ".join(f"WHEN '{grade}' THEN {points}" for grade, points in _GRADE_LUT.items())
+    + " ELSE 0.0 END"
+)
+
+# Templated advice served instead of model output when the coach runs with use_model=False
+STYLE_INSIGHTS = {
+    'Visual': 'Turn your notes into diagrams, charts and color-coded summaries.',
+    'Auditory': 'Explain concepts aloud and review recorded lectures with a study group.',
+    'Kinesthetic': 'Work hands-on practice problems and take short active study breaks.',
+    'Reading-Writing': 'Rewrite key ideas in your own words and do written practice problems.'
+}
+_IMPROVE_INSIGHT = "{advice} Aim to close the {gap:.1f} point GPA gap with similar students."
+_WELL_INSIGHT = "{advice} Keep up the habits that are working for you."
+
+# Study advice attached to every recommendation set, by learning style
+STYLE_ADVICE = {
+    'Visual': 'Use diagrams, charts, and visual study materials',
+    'Auditory': 'Try study groups and explaining concepts aloud',
+    'Kinesthetic': 'Use hands-on practice and real-world applications',
+    'Reading-Writing': 'Focus on note-taking and written practice'
+}
+
+# Bound formatters for the recommendation text
+_GPA_REC_TPL = "Work to improve GPA by {:.1f} points".format
+_GPA_WHY_TPL = "Similar {} learners average {:.2f} GPA".format
+_COURSE_REC_TPL = "Consider taking {:.0f} more courses".format
+_COURSE_WHY_TPL = "Similar students complete {:.0f} more courses on average".format
+_STYLE_WHY_TPL = "Optimized advice for {} learners".format
+
+# CALL subquery collecting up to 10 students sharing the learning style of `s`, with GPAs
+_PEERS_CALL_CYPHER = f"""CALL {{
+    WITH s
+    MATCH (p:Student)-[c:COMPLETED]->(:Course)
+    WHERE p.learningStyle = s.learningStyle
+    WITH p, avg({_GRADE_POINTS_CYPHER}) as peerGpa, count(c) as peerCourses
+    WHERE peerCourses >= 3
+    WITH p, peerGpa, peerCourses LIMIT 10
+    RETURN collect([p.name, peerGpa, peerCourses]) as peers
+}}"""
+
+# Queries are fixed strings so Neo4j can reuse their cached plans (see warm_up_queries)
+_Q_ELIGIBLE_IDS = """
+MATCH (s:Student)-[c:COMPLETED]->()
+WITH s, count(c) as courseCount
+WHERE courseCount >= 3
+RETURN s.id as id
+"""
+
+# The student's GPA is aggregated in Cypher, like the peers', so no grade list is sent
+_Q_STUDENT = f"""
+MATCH (s:Student {{id: $student_id}})-[c:COMPLETED]->(:Course)
+WITH s, avg({_GRADE_POINTS_CYPHER}) as gpa, count(c) as courseCount
+RETURN s.id as id, s.name as name, s.learningStyle as learningStyle,
+       s.preferredPace as preferredPace, gpa, courseCount
+"""
+
+_Q_SIMILAR_STUDENTS = f"""
+MATCH (s:Student)-[c:COMPLETED]->(course:Course)
+WHERE s.learningStyle = $learningStyle
+WITH s, avg({_GRADE_POINTS_CYPHER}) as gpa, count(c) as courseCount
+WHERE courseCount >= 3
+RETURN s.name as name, gpa, courseCount
+LIMIT 10
+"""
+
+_Q_STUDENTS_AND_PEERS = f"""
+UNWIND $student_ids as sid
+MATCH (s:Student {{id: sid}})-[c:COMPLETED]->(:Course)
+WITH s, collect(c.grade) as grades
+{_PEERS_CALL_CYPHER}
+RETURN s.id as id, s.name as name, s.learningStyle as learningStyle,
+       s.preferredPace as preferredPace, grades, size(grades) as courseCount, peers
+"""
+
+# A similar student, with their GPA computed in Cypher
+PeerRow = namedtuple('PeerRow', 'name gpa courseCount')
+
+def grade_points(grades):
+    """Map grade letters to an array of grade points"""
+    # Unknown grades (e.g. withdrawals) count as 0.0 points, same as an F
+    return _POINTS_ARR[[_GRADE_IDX.get(grade, _GRADE_IDX['F']) for grade in grades]]
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def bulk_gpa(codes, offsets, points):
+        """GPA of each segment codes[offsets[i]:offsets[i + 1]] of int8 grade codes"""
+        n = offsets.shape[0] - 1
+        gpas = np.zeros(n)
+        for i in numba.prange(n):
+            start, end = offsets[i], offsets[i + 1]
+            total = 0.0
+            for j in range(start, end):
+                total += points[codes[j]]
+            if end > start:
+                gpas[i] = total / (end - start)
+        return gpas
+else:
+    def bulk_gpa(codes, offsets, points):
+        """GPA of each segment codes[offsets[i]:offsets[i + 1]] of int8 grade codes"""
+        # Differences of a running total give each segment's sum, even for empty segments
+        running = np.concatenate(([0.0], np.cumsum(points[codes])))
+        lengths = np.diff(offsets)
+        sums = running[offsets[1:]] - running[offsets[:-1]]
+        return np.divide(sums, lengths, out=np.zeros(lengths.size), where=lengths > 0)
+
+def students_gpa(grade_lists):
+    """GPA for each list of grade letters, scored together with bulk_gpa"""
+    lengths = [len(grades) for grades in grade_lists]
+    codes = np.fromiter(
+        (_GRADE_IDX.get(grade, _GRADE_IDX['F']) for grades in grade_lists for grade in grades),
+        dtype=np.int8, count=sum(lengths)
+    )
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return bulk_gpa(codes, offsets, _POINTS_ARR)
+
 class SimpleAIStudyCoach:
-    def __init__(self):
-        # Neo4j connection
-        self.driver = GraphDatabase.driver("bolt://localhost:7687", auth=("neo4j", "yourpassword"))
+    def __init__(self, use_model=True):
+        # Neo4j connection, with a bounded pool shared by concurrent requests
+        driver_config = dict(
+            auth=("neo4j", "yourpassword"),
+            max_connection_pool_size=50,
+            connection_acquisition_timeout=30,
+            max_connection_lifetime=3600
+        )
+        self.driver = GraphDatabase.driver("bolt://localhost:7687", **driver_config)
+        # Async driver for aget_recommendations, created on first use (per event loop, see
+        # _get_adriver) so sync users never open it
+        self.adriver = None
+        self._adriver_loop = None
+        self._adriver_factory = functools.partial(
+            AsyncGraphDatabase.driver, "bolt://localhost:7687", **driver_config
+        )
+        # Naming the database saves the server a default-database lookup per session
+        self._db = "neo4j"
+        
+        # Ids of students eligible for analysis, loaded on first use
+        self._eligible_ids = None
+        
+        # Least-recently-used insights per (learning style, GPA gap bucket, performing well)
+        self._insight_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # (fetch time, peer statistics) per learning style, see _get_peer_stats
+        self._peer_cache = {}
+        
+        # Without the model, insights come from STYLE_INSIGHTS templates
+        self.use_model = use_model
+        
+        # The local AI model is loaded on first use (see _ensure_model)
+        self.tokenizer = None
+        self.model = None
+        self._model_lock = threading.Lock()
+        
+        # Make sure id lookups and learning style filters are index-backed,
+        # then plan the hot queries up front so the first request doesn't pay for it
+        try:
+            self.ensure_indexes()
+            self.warm_up_queries()
+        except Exception as e:
+            print(f"Warning: Could not prepare Neo4j indexes and queries: {e}")
+
+    def _ensure_model(self):
+        """Load the local AI model if it hasn't been loaded yet"""
+        if self.model is None:
+            with self._model_lock:
+                if self.model is None:
+                    self._load_model()
+
+    def _load_model(self):
+        """Load the local AI model; transformers is only imported when it is needed"""
+        import torch
+        from transformers import GPT2LMHeadModel, GPT2Tokenizer
         
-        # Initialize local AI model
         print("Loading AI model...")
-        self.tokenizer = GPT2Tokenizer.from_pretrained("microsoft/DialoGPT-small")
-        self.model = GPT2LMHeadModel.from_pretrained("microsoft/DialoGPT-small")
-        
-        if self.tokenizer.pad_token is None:
-            self.tokenizer.pad_token = self.tokenizer.eos_token
-        
-        self.text_generator = pipeline(
-            "text-generation",
-            model=self.model,
-            tokenizer=self.tokenizer,
-            max_length=120,
-            num_return_sequences=1,
-            temperature=0.7,
-            do_sample=True,
-            pad_token_id=self.tokenizer.eos_token_id
-        )
+        # Short generations gain nothing from every core; leave room for the rest of the box
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only allowed before torch starts inter-op work, e.g. when torch was used elsewhere first
+            pass
+        tokenizer = GPT2Tokenizer.from_pretrained("microsoft/DialoGPT-small")
+        model = GPT2LMHeadModel.from_pretrained("microsoft/DialoGPT-small")
+        model.eval()
+        
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        # Batched prompts are padded on the left so generation continues from each prompt
+        tokenizer.padding_side = "left"
+        
+        self.tokenizer = tokenizer
+        # Set last: a loaded model means the tokenizer is ready too
+        self.model = model
         
         print("AI model loaded successfully!")
 
+    def ensure_indexes(self):
+        """Create the Student id constraint and learning style index used by the queries"""
+        with self.driver.session(database=self._db) as session:
+            session.run(
+                "CREATE CONSTRAINT student_id IF NOT EXISTS FOR (s:Student) REQUIRE s.id IS UNIQUE"
+            ).consume()
+            session.run(
+                "CREATE INDEX student_learning_style IF NOT EXISTS FOR (s:Student) ON (s.learningStyle)"
+            ).consume()
+
+    def warm_up_queries(self):
+        """Run the hot queries once so Neo4j has their plans cached before the first request"""
+        self._get_eligible_ids()
+        with self.driver.session(database=self._db) as session:
+            session.run(_Q_STUDENT, student_id="").consume()
+            session.run(_Q_STUDENTS_AND_PEERS, student_ids=[]).consume()
+            session.run(_Q_SIMILAR_STUDENTS, learningStyle="").consume()
+
+    def _get_eligible_ids(self):
+        """Get (and cache) the ids of students with enough completed courses"""
+        if self._eligible_ids is not None:
+            return self._eligible_ids
+        # One row per id streams in fetch-size batches instead of one huge collected list
+        with self.driver.session(database=self._db) as session:
+            eligible_ids = [record[0] for record in session.run(_Q_ELIGIBLE_IDS)]
+        # An empty graph (e.g. before the import) isn't cached, so later calls look again
+        if eligible_ids:
+            self._eligible_ids = eligible_ids
+        return eligible_ids
+
+    def refresh_student_ids(self):
+        """Drop the cached student ids after the graph changes"""
+        self._eligible_ids = None
+
     def get_random_student(self):
         """Get a random student with course data"""
-        with self.driver.session() as session:
-            query = """
-            MATCH (s:Student)-[c:COMPLETED]->(course:Course)
-            WITH s, count(c) as courseCount
-            WHERE courseCount >= 3
-            WITH s ORDER BY rand() LIMIT 1
-            MATCH (s)-[c:COMPLETED]->(course:Course)
-            RETURN s.id as id, s.name as name, s.learningStyle as learningStyle, 
-                   s.preferredPace as preferredPace,
-                   collect(c.grade) as grades,
-                   collect(course.name) as courseNames
-            """
-            result = session.run(query)
+        eligible_ids = self._get_eligible_ids()
+        if not eligible_ids:
+            return None
+        
+        with self.driver.session(database=self._db) as session:
+            result = session.run(_Q_STUDENT, student_id=random.choice(eligible_ids))
             record = result.single()
             return dict(record) if record else None
 
     def find_similar_students(self, target_learning_style):
         """Find students with similar learning style and their performance"""
-        with self.driver.session() as session:
-            query = """
-            MATCH (s:Student)-[c:COMPLETED]->(course:Course)
-            WHERE s.learningStyle = $learningStyle
-            WITH s, collect(c.grade) as grades, count(c) as courseCount
-            WHERE courseCount >= 3
-            RETURN s.name as name, s.learningStyle as learningStyle,
-                   s.preferredPace as preferredPace, grades, courseCount
-            LIMIT 10
-            """
-            result = session.run(query, learningStyle=target_learning_style)
-            return [dict(record) for record in result]
+        with self.driver.session(database=self._db) as session:
+            result = session.run(_Q_SIMILAR_STUDENTS, learningStyle=target_learning_style)
+            return [PeerRow(record['name'], record['gpa'], record['courseCount']) for record in result]
+
+    def peer_stats(self, similar_students):
+        """Summarize similar students (a list of PeerRow) for analyze_performance"""
+        # Lay the peers out as arrays (GPAs are computed in Cypher) for vectorized stats
+        count = len(similar_students)
+        gpas = np.fromiter((s.gpa for s in similar_students), dtype=np.float64, count=count)
+        courses = np.fromiter((s.courseCount for s in similar_students), dtype=np.int32, count=count)
+        return {
+            'avg_gpa': gpas.mean() if count else 0.0,
+            'avg_courses': courses.mean() if count else 0,
+            'gpas': gpas
+        }
+
+    def _cached_peer_stats(self, learning_style):
+        """Peer statistics for a learning style if they were fetched within PEER_STATS_TTL"""
+        cached = self._peer_cache.get(learning_style)
+        if cached is not None and time.monotonic() - cached[0] < PEER_STATS_TTL:
+            return cached[1]
+        return None
+
+    def _store_peer_stats(self, learning_style, similar_students):
+        """Summarize and cache peers; styles without peers aren't cached so they are retried"""
+        stats = self.peer_stats(similar_students)
+        if similar_students:
+            self._peer_cache[learning_style] = (time.monotonic(), stats)
+        return stats
+
+    def _get_peer_stats(self, learning_style):
+        """Get (and cache for PEER_STATS_TTL seconds) peer statistics for a learning style"""
+        stats = self._cached_peer_stats(learning_style)
+        if stats is None:
+            stats = self._store_peer_stats(learning_style, self.find_similar_students(learning_style))
+        return stats
+
+    def _peer_cache_warm(self):
+        """Whether fresh peer statistics are cached for every learning style in STYLE_ADVICE"""
+        return all(self._cached_peer_stats(style) is not None for style in STYLE_ADVICE)
+
+    def refresh_peer_stats(self):
+        """Drop cached peer statistics after the graph changes"""
+        self._peer_cache.clear()
+
+    def fetch_student_and_peers(self):
+        """Get a random student and students with the same learning style in one query"""
+        eligible_ids = self._get_eligible_ids()
+        if not eligible_ids:
+            return None, []
+        return self.fetch_students_and_peers([random.choice(eligible_ids)])[0]
+
+    def fetch_students_and_peers(self, student_ids):
+        """Get the given students and their similar students in one query
+        
+        Returns a (student, similar_students) pair per id, in order, with
+        (None, []) for ids that have no completed courses.
+        """
+        with self.driver.session(database=self._db) as session:
+            result = session.run(_Q_STUDENTS_AND_PEERS, student_ids=list(student_ids))
+            students = {}
+            for record in result:
+                student = dict(record)
+                peers = [PeerRow(*peer) for peer in student.pop('peers')]
+                students[student['id']] = (student, peers)
+        
+        return [students.get(student_id, (None, [])) for student_id in student_ids]
 
     def calculate_gpa(self, grades):
         """Calculate GPA from grades"""
-        grade_points = {
-            'A': 4.0, 'A-': 3.7, 'B+': 3.3, 'B': 3.0, 'B-': 2.7,
-            'C+': 2.3, 'C': 2.0, 'C-': 1.7, 'D+': 1.3, 'D': 1.0, 'F': 0.0
-        }
         if not grades:
             return 0.0
-        points = [grade_points.get(grade, 0.0) for grade in grades]
-        return sum(points) / len(points)
+        return float(grade_points(grades).mean())
 
-    def analyze_performance(self, target_student, similar_students):
-        """Analyze performance compared to similar students"""
-        target_gpa = self.calculate_gpa(target_student['grades'])
-        target_courses = len(target_student['grades'])
+    def analyze_performance(self, target_student, similar_students=None, target_gpa=None, peer_stats=None):
+        """Analyze performance compared to similar students (a list of PeerRow)
         
-        # Calculate stats for similar students
-        similar_gpas = [self.calculate_gpa(s['grades']) for s in similar_students]
-        similar_courses = [s['courseCount'] for s in similar_students]
-        
-        # Find better performers
-        better_performers = [gpa for gpa in similar_gpas if gpa > target_gpa]
+        Callers holding peer_stats() output can pass it as `peer_stats` instead of
+        a peer list, and bulk callers can pass the student's precomputed `target_gpa`.
+        Students fetched one at a time carry their `gpa` and `courseCount` from Cypher;
+        otherwise both are derived from the student's `grades`.
+        """
+        if peer_stats is None:
+            peer_stats = self.peer_stats(similar_students)
+        if target_gpa is None:
+            target_gpa = target_student.get('gpa')
+        if target_gpa is None:
+            target_gpa = self.calculate_gpa(target_student['grades'])
+        target_courses = target_student.get('courseCount')
+        if target_courses is None:
+            target_courses = len(target_student['grades'])
+        similar_gpas = peer_stats['gpas']
         
         analysis = {
             'target_gpa': target_gpa,
             'target_courses': target_courses,
-            'similar_avg_gpa': np.mean(similar_gpas) if similar_gpas else 0.0,
-            'similar_avg_courses': np.mean(similar_courses) if similar_courses else 0,
-            'better_performers_count': len(better_performers),
-            'total_similar_count': len(similar_students),
+            'similar_avg_gpa': peer_stats['avg_gpa'],
+            'similar_avg_courses': peer_stats['avg_courses'],
+            'better_performers_count': int((similar_gpas > target_gpa).sum()),
+            'total_similar_count': len(similar_gpas),
             'learning_style': target_student['learningStyle'],
             'preferred_pace': target_student['preferredPace']
         }
         
         return analysis
 
+    def _insight_key(self, analysis):
+        """Bucket an analysis into (learning style, GPA gap bucket, performing well)"""
+        gpa_diff = analysis['similar_avg_gpa'] - analysis['target_gpa']
+        performing_well = gpa_diff <= 0.2
+        # The prompt only mentions the gap (to 0.1 points) for students who need to improve
+        diff_bucket = 0 if performing_well else int(round(gpa_diff * 10))
+        return analysis['learning_style'], diff_bucket, performing_well
+
     def generate_ai_insights(self, analysis):
-        """Generate AI insights based on analysis"""
+        """Generate AI insights based on analysis, reusing results for similar analyses"""
         try:
-            learning_style = analysis['learning_style']
-            gpa_diff = analysis['similar_avg_gpa'] - analysis['target_gpa']
-            
-            if gpa_diff > 0.2:
-                context = f"{learning_style} learner needs to improve {gpa_diff:.1f} GPA points"
-            else:
-                context = f"{learning_style} learner performing well"
-            
-            prompt = f"Study advice for {context}:"
-            
-            generated = self.text_generator(prompt, max_length=len(prompt.split()) + 30)
-            ai_text = generated[0]['generated_text'].replace(prompt, '').strip()
-            
-            return ai_text
+            key = self._insight_key(analysis)
+            return self._get_insights([key])[key]
         except Exception as e:
             print(f"AI generation error: {e}")
             return "Focus on consistent study habits and seek help when needed."
 
+    def generate_ai_insights_batch(self, analyses):
+        """Generate AI insights for several analyses, running the model once for all cache misses"""
+        keys = [self._insight_key(analysis) for analysis in analyses]
+        try:
+            insights = self._get_insights(list(dict.fromkeys(keys)))
+            return [insights[key] for key in keys]
+        except Exception as e:
+            print(f"AI generation error: {e}")
+            return ["Focus on consistent study habits and seek help when needed."] * len(analyses)
+
+    def _get_insights(self, keys):
+        """Look up insights for distinct bucket keys, generating the misses in one batch"""
+        with self._cache_lock:
+            insights = {key: self._insight_cache[key] for key in keys if key in self._insight_cache}
+            for key in insights:
+                self._insight_cache.move_to_end(key)
+        
+        missing = [key for key in keys if key not in insights]
+        if missing:
+            # Raises on failure, so errors are never cached
+            generated = dict(zip(missing, self._generate_insights(missing)))
+            with self._cache_lock:
+                self._insight_cache.update(generated)
+                while len(self._insight_cache) > INSIGHT_CACHE_SIZE:
+                    self._insight_cache.popitem(last=False)
+            insights.update(generated)
+        return insights
+
+    def _generate_insights(self, keys):
+        """Produce the insight text for each bucket key, batching model prompts"""
+        if not self.use_model:
+            return [self._template_insight(*key) for key in keys]
+        
+        import torch
+        
+        self._ensure_model()
+        prompts = [self._insight_prompt(*key) for key in keys]
+        inputs = self.tokenizer(prompts, return_tensors='pt', padding=True)
+        # No autograd bookkeeping is needed for generation
+        with torch.inference_mode():
+            output_ids = self.model.generate(
+                **inputs,
+                max_new_tokens=30,
+                do_sample=True,
+                temperature=0.7,
+                pad_token_id=self.tokenizer.eos_token_id
+            )
+        # Prompts are left-padded to the same length, so new tokens start at the same column
+        new_tokens = output_ids[:, inputs['input_ids'].shape[1]:]
+        return [text.strip() for text in self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)]
+
+    def _insight_prompt(self, learning_style, diff_bucket, performing_well):
+        """Build the text generator prompt for one insight bucket"""
+        if performing_well:
+            context = f"{learning_style} learner performing well"
+        else:
+            context = f"{learning_style} learner needs to improve {diff_bucket / 10:.1f} GPA points"
+        return f"Study advice for {context}:"
+
+    def _template_insight(self, learning_style, diff_bucket, performing_well):
+        """Templated insight used when the coach runs without the model"""
+        advice = STYLE_INSIGHTS.get(learning_style, 'Focus on consistent study habits.')
+        if performing_well:
+            return _WELL_INSIGHT.format(advice=advice)
+        return _IMPROVE_INSIGHT.format(advice=advice, gap=diff_bucket / 10)
+
     def create_recommendations(self, analysis, ai_insight):
         """Create structured recommendations"""
         recommendations = []
+        learning_style = analysis['learning_style']
         
         # GPA recommendation
         gpa_gap = analysis['similar_avg_gpa'] - analysis['target_gpa']
         if gpa_gap > 0.1:
             recommendations.append({
                 'category': 'Academic Performance',
-                'recommendation': f"Work to improve GPA by {gpa_gap:.1f} points",
-                'explanation': f"Similar {analysis['learning_style']} learners average {analysis['similar_avg_gpa']:.2f} GPA",
+                'recommendation': _GPA_REC_TPL(gpa_gap),
+                'explanation': _GPA_WHY_TPL(learning_style, analysis['similar_avg_gpa']),
                 'ai_insight': ai_insight
             })
         
@@ -137,23 +484,17 @@ class SimpleAIStudyCoach:
         if course_gap > 1:
             recommendations.append({
                 'category': 'Course Planning',
-                'recommendation': f"Consider taking {course_gap:.0f} more courses",
-                'explanation': f"Similar students complete {course_gap:.0f} more courses on average"
+                'recommendation': _COURSE_REC_TPL(course_gap),
+                'explanation': _COURSE_WHY_TPL(course_gap)
             })
         
         # Learning style advice
-        style_advice = {
-            'Visual': 'Use diagrams, charts, and visual study materials',
-            'Auditory': 'Try study groups and explaining concepts aloud',
-            'Kinesthetic': 'Use hands-on practice and real-world applications',
-            'Reading-Writing': 'Focus on note-taking and written practice'
-        }
-        
-        if analysis['learning_style'] in style_advice:
+        style_advice = STYLE_ADVICE.get(learning_style)
+        if style_advice is not None:
             recommendations.append({
                 'category': 'Learning Style',
-                'recommendation': style_advice[analysis['learning_style']],
-                'explanation': f"Optimized advice for {analysis['learning_style']} learners"
+                'recommendation': style_advice,
+                'explanation': _STYLE_WHY_TPL(learning_style)
             })
         
         return recommendations
@@ -161,32 +502,71 @@ class SimpleAIStudyCoach:
     def get_recommendations(self):
         """Main method to get study recommendations"""
         try:
-            # Get a random student
-            student = self.get_random_student()
-            if not student:
-                return {"error": "No student data found"}
+            # While every style's peer statistics are cached only the student is queried;
+            # otherwise the student and their peers come back in one round trip
+            if self._peer_cache_warm():
+                student = self.get_random_student()
+                if not student:
+                    return {"error": "No student data found"}
+                peer_stats = self._get_peer_stats(student['learningStyle'])
+            else:
+                student, similar_students = self.fetch_student_and_peers()
+                if not student:
+                    return {"error": "No student data found"}
+                peer_stats = self._store_peer_stats(student['learningStyle'], similar_students)
             
-            # Find similar students
-            similar_students = self.find_similar_students(student['learningStyle'])
-            if not similar_students:
+            if not len(peer_stats['gpas']):
                 return {"error": "No similar students found"}
             
             # Analyze performance
-            analysis = self.analyze_performance(student, similar_students)
+            analysis = self.analyze_performance(student, peer_stats=peer_stats)
             
             # Generate AI insights
             ai_insight = self.generate_ai_insights(analysis)
             
-            # Create recommendations
-            recommendations = self.create_recommendations(analysis, ai_insight)
+            return self._build_result(student, analysis, ai_insight)
+            
+        except Exception as e:
+            import traceback
+            print(f"Error: {e}")
+            traceback.print_exc()
+            return {"error": str(e)}
+
+    async def aget_recommendations(self):
+        """Async get_recommendations, loading the model while the peer query runs
+        
+        The async driver's connections belong to the event loop it was created on;
+        calls from another loop (e.g. a second asyncio.run) get a fresh driver.
+        """
+        try:
+            # A cold id cache means a full graph scan; keep it off the event loop
+            eligible_ids = await asyncio.to_thread(self._get_eligible_ids)
+            if not eligible_ids:
+                return {"error": "No student data found"}
+            student = await self._aget_student(random.choice(eligible_ids))
+            if not student:
+                return {"error": "No student data found"}
+            
+            learning_style = student['learningStyle']
+            peer_stats = self._cached_peer_stats(learning_style)
+            if peer_stats is None:
+                # The prompt depends on the peers' GPAs, so only the model load can overlap the query
+                peers_task = asyncio.create_task(self._afind_similar_students(learning_style))
+                if self.use_model:
+                    try:
+                        await asyncio.to_thread(self._ensure_model)
+                    except Exception as e:
+                        # generate_ai_insights falls back to default advice, as in the sync path
+                        print(f"AI model load error: {e}")
+                peer_stats = self._store_peer_stats(learning_style, await peers_task)
+            if not len(peer_stats['gpas']):
+                return {"error": "No similar students found"}
+            
+            analysis = self.analyze_performance(student, peer_stats=peer_stats)
+            # Generation is CPU bound; keep it off the event loop
+            ai_insight = await asyncio.to_thread(self.generate_ai_insights, analysis)
             
-            return {
-                'student': student,
-                'analysis': analysis,
-                'recommendations': recommendations,
-                'ai_insight': ai_insight,
-                'success': True
-            }
+            return self._build_result(student, analysis, ai_insight)
             
         except Exception as e:
             import traceback
@@ -194,9 +574,104 @@ class SimpleAIStudyCoach:
             traceback.print_exc()
             return {"error": str(e)}
 
+    def _get_adriver(self):
+        """Get the async Neo4j driver, creating it for the running event loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self.adriver is None or self._adriver_loop is not loop:
+            # A driver from an earlier loop is dropped rather than closed: its pooled
+            # connections can only be closed on that loop, which is usually gone
+            self.adriver = self._adriver_factory()
+            self._adriver_loop = loop
+        return self.adriver
+
+    async def _aget_student(self, student_id):
+        """Get one student with course data over the async driver"""
+        async with self._get_adriver().session(database=self._db) as session:
+            result = await session.run(_Q_STUDENT, student_id=student_id)
+            record = await result.single()
+            return dict(record) if record else None
+
+    async def _afind_similar_students(self, target_learning_style):
+        """find_similar_students over the async driver"""
+        async with self._get_adriver().session(database=self._db) as session:
+            result = await session.run(_Q_SIMILAR_STUDENTS, learningStyle=target_learning_style)
+            return [PeerRow(record['name'], record['gpa'], record['courseCount'])
+                    async for record in result]
+
+    def get_recommendations_batch(self, count):
+        """Get study recommendations for `count` random students with batched AI insights"""
+        try:
+            eligible_ids = self._get_eligible_ids()
+            if not eligible_ids:
+                return [{"error": "No student data found"} for _ in range(count)]
+            return self._recommend_many(self.fetch_students_and_peers(random.choices(eligible_ids, k=count)))
+        except Exception as e:
+            import traceback
+            print(f"Error: {e}")
+            traceback.print_exc()
+            return [{"error": str(e)} for _ in range(count)]
+
+    def get_recommendations_bulk(self, student_ids):
+        """Get study recommendations for the given students with one Neo4j query"""
+        try:
+            return self._recommend_many(self.fetch_students_and_peers(student_ids))
+        except Exception as e:
+            import traceback
+            print(f"Error: {e}")
+            traceback.print_exc()
+            return [{"error": str(e)} for _ in student_ids]
+
+    def _recommend_many(self, fetched):
+        """Build results for (student, similar_students) pairs, batching the AI insights"""
+        results = [None] * len(fetched)
+        found = []
+        for i, (student, similar_students) in enumerate(fetched):
+            if not student:
+                results[i] = {"error": "No student data found"}
+            elif not similar_students:
+                results[i] = {"error": "No similar students found"}
+            else:
+                found.append((i, student, similar_students))
+        
+        # Score every student's grades in one bulk_gpa call
+        target_gpas = students_gpa([student['grades'] for _, student, _ in found])
+        pending = [
+            (i, student, self.analyze_performance(student, similar_students, float(target_gpa)))
+            for (i, student, similar_students), target_gpa in zip(found, target_gpas)
+        ]
+        
+        # One model call covers every student still missing an insight
+        insights = self.generate_ai_insights_batch([analysis for _, _, analysis in pending])
+        for (i, student, analysis), ai_insight in zip(pending, insights):
+            results[i] = self._build_result(student, analysis, ai_insight)
+        return results
+
+    def _build_result(self, student, analysis, ai_insight):
+        """Assemble the recommendations response for one student"""
+        return {
+            'student': student,
+            'analysis': analysis,
+            'recommendations': self.create_recommendations(analysis, ai_insight),
+            'ai_insight': ai_insight,
+            'success': True
+        }
+
     def close(self):
+        with self._cache_lock:
+            self._insight_cache.clear()
         self.driver.close()
 
+    async def aclose(self):
+        """Close both drivers; use instead of close() when the async path was used
+        
+        Await it on the same event loop as the last aget_recommendations call.
+        """
+        self.close()
+        if self.adriver is not None:
+            await self.adriver.close()
+            self.adriver = None
+            self._adriver_loop = None
+
 # Test the simple AI coach
 if __name__ == "__main__":
     coach = SimpleAIStudyCoach()
@@ -214,7 +689,7 @@ if __name__ == "__main__":
         print(f"\n📊 Student: {student['name']}")
         print(f"Learning Style: {student['learningStyle']}")
         print(f"Preferred Pace: {student['preferredPace']}")
-        print(f"Completed Courses: {len(student['grades'])}")
+        print(f"Completed Courses: {student['courseCount']}")
         
         print(f"\n📈 Performance Analysis:")
         print(f"Your GPA: {analysis['target_gpa']:.2f}")